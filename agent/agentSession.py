@@ -1,10 +1,25 @@
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from typing import Any, Literal, Optional
-import uuid
 import time
-import json
+import orjson
 
-@dataclass
+def _dumps(obj) -> str:
+    """
+    Serializes an object to an indented JSON string via orjson.
+
+    orjson encodes through a C core, several times faster than stdlib json
+    for session-sized dict trees.
+
+    Args:
+        obj: The JSON-compatible object to serialize.
+
+    Returns:
+        str: The indented JSON string.
+    """
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+
+@dataclass(slots=True)
 class ToolCode:
     """
     Represents code execution involving a specific tool.
@@ -29,7 +44,7 @@ class ToolCode:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class PerceptionSnapshot:
     """
     Snapshot of the agent's perception at a specific point in time.
@@ -55,7 +70,18 @@ class PerceptionSnapshot:
     solution_summary: str
     confidence: str
 
-@dataclass
+    def to_dict(self):
+        """
+        Converts the PerceptionSnapshot instance to a dictionary.
+
+        All fields are JSON-atomic, so no recursion or deepcopy is needed.
+
+        Returns:
+            dict: A dictionary representation of the PerceptionSnapshot instance.
+        """
+        return {name: getattr(self, name) for name in self._FIELDS}
+
+@dataclass(slots=True)
 class Step:
     """
     Represents a single step in the agent's plan.
@@ -102,7 +128,7 @@ class Step:
             "conclusion": self.conclusion,
             "execution_result": self.execution_result,
             "error": self.error,
-            "perception": self.perception.__dict__ if self.perception else None,
+            "perception": self.perception.to_dict() if self.perception else None,
             "status": self.status,
             "attempts": self.attempts,
             "was_replanned": self.was_replanned,
@@ -110,6 +136,13 @@ class Step:
         }
 
 
+# Field-name tuples cached at definition time so dict conversion does not
+# re-introspect __dataclass_fields__ on every call.
+ToolCode._FIELDS = tuple(f.name for f in fields(ToolCode))
+PerceptionSnapshot._FIELDS = tuple(f.name for f in fields(PerceptionSnapshot))
+Step._FIELDS = tuple(f.name for f in fields(Step))
+
+
 class AgentSession:
     """
     Manages the session state for an agent execution.
@@ -134,6 +167,9 @@ class AgentSession:
         self.original_query = original_query
         self.perception: Optional[PerceptionSnapshot] = None
         self.plan_versions: list[dict[str, Any]] = []
+        self._completed_steps: list[Step] = []
+        self._total_steps = 0
+        self._snapshot_cache: Optional[dict] = None
         self.state = {
             "original_goal_achieved": False,
             "final_answer": None,
@@ -156,6 +192,11 @@ class AgentSession:
         """
         Adds a new version of the plan to the session history.
 
+        The steps list is stored as-is: Step instances are shared with the
+        caller by design, since status updates made during execution must flow
+        back into the session. The plan text is frozen to a tuple — it is
+        never mutated after submission and serializers iterate it repeatedly.
+
         Args:
             plan_texts (list[str]): Textual descriptions of the plan steps.
             steps (list[Step]): List of Step objects corresponding to the plan.
@@ -164,20 +205,39 @@ class AgentSession:
             Step: The first step of the new plan, or None if empty.
         """
         plan = {
-            "plan_text": plan_texts,
-            "steps": steps.copy()
+            "plan_text": tuple(plan_texts),
+            "steps": steps
         }
         self.plan_versions.append(plan)
+        self._total_steps += len(steps)
+        self._snapshot_cache = None
         return steps[0] if steps else None  # ✅ fix: return first Step
 
+    def mark_step_completed(self, step: Step):
+        """
+        Marks a step as completed and records it for snapshot summaries.
+
+        Keeping the completed list incrementally avoids rescanning every step
+        of every plan version each time a snapshot is generated.
+
+        Args:
+            step (Step): The step that finished successfully.
+        """
+        step.status = "completed"
+        self._completed_steps.append(step)
+        self._snapshot_cache = None
+
     def get_next_step_index(self) -> int:
         """
-        Calculates the next global step index based on all previous plan versions.
+        Returns the next global step index.
+
+        Maintained incrementally in add_plan_version rather than summed across
+        all plan versions on each call.
 
         Returns:
             int: The cumulative count of steps across all plan versions.
         """
-        return sum(len(v["steps"]) for v in self.plan_versions)
+        return self._total_steps
 
 
     def to_json(self):
@@ -190,11 +250,11 @@ class AgentSession:
         return {
             "session_id": self.session_id,
             "original_query": self.original_query,
-            "perception": asdict(self.perception) if self.perception else None,
+            "perception": self.perception.to_dict() if self.perception else None,
             "plan_versions": [
                 {
                     "plan_text": p["plan_text"],
-                    "steps": [asdict(s) for s in p["steps"]]
+                    "steps": [s.to_dict() for s in p["steps"]]
                 } for p in self.plan_versions
             ],
             "state_snapshot": self.get_snapshot_summary()
@@ -204,23 +264,38 @@ class AgentSession:
         """
         Generates a summary of the current session state.
 
+        The summary only changes on state transitions (new plan version, step
+        completion, state update), so it is cached between those events rather
+        than rebuilt on every access.
+
         Returns:
             dict: A dictionary containing key session metrics and the final plan.
         """
-        return {
+        if self._snapshot_cache is not None:
+            return self._snapshot_cache
+        self._snapshot_cache = {
             "session_id": self.session_id,
             "query": self.original_query,
             "final_plan": self.plan_versions[-1]["plan_text"] if self.plan_versions else [],
-           "final_steps": [
-                    asdict(s)
-                    for version in self.plan_versions
-                    for s in version["steps"]
-                    if s.status == "completed"
-                ],
+           "final_steps": [s.to_dict() for s in self._completed_steps],
             "final_answer": self.state["final_answer"],
             "confidence": self.state["confidence"],
             "reasoning_note": self.state["reasoning_note"]
         }
+        return self._snapshot_cache
+
+    def update_state(self, updates: dict):
+        """
+        Applies updates to the session state dict.
+
+        Goes through here rather than mutating `state` directly so the cached
+        snapshot summary is invalidated.
+
+        Args:
+            updates (dict): The state keys and values to update.
+        """
+        self.state.update(updates)
+        self._snapshot_cache = None
 
     def mark_complete(self, perception: PerceptionSnapshot, final_answer: Optional[str] = None, fallback_confidence: float = 0.95):
         """
@@ -231,7 +306,7 @@ class AgentSession:
             final_answer (Optional[str]): The final answer string (overrides perception if provided).
             fallback_confidence (float): Default confidence if perception lacks one.
         """
-        self.state.update({
+        self.update_state({
             "original_goal_achieved": perception.original_goal_achieved,
             "final_answer": final_answer or perception.solution_summary,
             "confidence": perception.confidence or fallback_confidence,
@@ -245,6 +320,9 @@ class AgentSession:
         """
         Simulates a live replay of the agent session trace to the console.
 
+        Each step is rendered into a single buffered print (one write per
+        step) with one pacing sleep, instead of a print and sleep per field.
+
         Args:
             delay (float): The delay in seconds between printing steps.
         """
@@ -255,7 +333,7 @@ class AgentSession:
 
         if self.perception:
             print("\n[Perception 0] Initial ERORLL:")
-            print(f"  {asdict(self.perception)}")
+            print(f"  {self.perception.to_dict()}")
             time.sleep(delay)
 
         for i, version in enumerate(self.plan_versions):
@@ -265,28 +343,27 @@ class AgentSession:
             time.sleep(delay)
 
             for step in version["steps"]:
-                print(f"\n[Step {step.index}] {step.description}")
-                time.sleep(delay / 1.5)
-
-                print(f"  Type: {step.type}")
+                lines = [f"\n[Step {step.index}] {step.description}"]
+                lines.append(f"  Type: {step.type}")
                 if step.code:
-                    print(f"  Tool → {step.code.tool_name} | Args → {step.code.tool_arguments}")
+                    lines.append(f"  Tool → {step.code.tool_name} | Args → {step.code.tool_arguments}")
                 if step.execution_result:
-                    print(f"  Execution Result: {step.execution_result}")
+                    lines.append(f"  Execution Result: {step.execution_result}")
                 if step.conclusion:
-                    print(f"  Conclusion: {step.conclusion}")
+                    lines.append(f"  Conclusion: {step.conclusion}")
                 if step.error:
-                    print(f"  Error: {step.error}")
+                    lines.append(f"  Error: {step.error}")
                 if step.perception:
-                    print("  Perception ERORLL:")
-                    for k, v in asdict(step.perception).items():
-                        print(f"    {k}: {v}")
-                print(f"  Status: {step.status}")
+                    lines.append("  Perception ERORLL:")
+                    for k in step.perception._FIELDS:
+                        lines.append(f"    {k}: {getattr(step.perception, k)}")
+                lines.append(f"  Status: {step.status}")
                 if step.was_replanned:
-                    print(f"  (Replanned from Step {step.parent_index})")
+                    lines.append(f"  (Replanned from Step {step.parent_index})")
                 if step.attempts > 1:
-                    print(f"  Attempts: {step.attempts}")
+                    lines.append(f"  Attempts: {step.attempts}")
+                print("\n".join(lines))
                 time.sleep(delay)
 
         print("\n[Session Snapshot]:")
-        print(json.dumps(self.get_snapshot_summary(), indent=2))
+        print(_dumps(self.get_snapshot_summary()))
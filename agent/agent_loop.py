@@ -79,7 +79,7 @@ class AgentLoop:
         # EXIT early if perception is confident
         if perception_result.get("original_goal_achieved"):
             print("\n✅ Perception has already fully answered the query.")
-            session.state.update({
+            session.update_state({
                 "original_goal_achieved": True,
                 "final_answer": perception_result.get("solution_summary", "Answer ready."),
                 "confidence": perception_result.get("confidence", 0.95),
@@ -143,7 +143,7 @@ class AgentLoop:
                 # print(small_result[:100] + "\n")
                 # print("-"*50)
 
-                step_obj.status = "completed"
+                session.mark_step_completed(step_obj)
 
                 perception_input = self.perception.build_perception_input(
                                 raw_input=executor_response.get('result', 'Tool Failed'),
@@ -160,7 +160,7 @@ class AgentLoop:
 
                 if step_obj.perception.original_goal_achieved and step_obj.type != "CONCLUDE":
                     print("\n✅ Perception says original goal is satisfied at this CODE step.")
-                    session.state.update({
+                    session.update_state({
                         "original_goal_achieved": True,
                         "final_answer": step_obj.execution_result,
                         "confidence": step_obj.perception.confidence,
@@ -254,7 +254,7 @@ class AgentLoop:
 
             elif step_obj.type == "CONCLUDE":
                 print(f"\n💡 Conclusion: {step_obj.conclusion}")
-                step_obj.status = "completed"
+                session.mark_step_completed(step_obj)
                 step_obj.execution_result = step_obj.conclusion
 
                 # 🧠 Run perception on conclusion text
@@ -272,7 +272,7 @@ class AgentLoop:
 
 
 
-                session.state.update({
+                session.update_state({
                     "original_goal_achieved": perception_result["original_goal_achieved"],
                     "final_answer": step_obj.conclusion,
                     "confidence": perception_result.get("confidence", 0.95),
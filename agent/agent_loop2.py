@@ -138,7 +138,7 @@ class AgentLoop:
             perception_result (dict): The result from the perception module indicating success.
         """
         print("\n✅ Perception fully answered the query.")
-        session.state.update({
+        session.update_state({
             "original_goal_achieved": True,
             "final_answer": perception_result.get("solution_summary", "Answer ready."),
             "confidence": perception_result.get("confidence", 0.95),
@@ -204,7 +204,7 @@ class AgentLoop:
             executor_response = await run_user_code(step.code.tool_arguments["code"], self.multi_mcp)
             step.execution_result = executor_response
             import pdb; pdb.set_trace()
-            step.status = "completed"
+            session.mark_step_completed(step)
 
             perception_result = self.run_perception(
                 query=executor_response.get('result', 'Tool Failed'),
@@ -231,7 +231,7 @@ class AgentLoop:
         elif step.type == "CONCLUDE":
             print(f"\n💡 Conclusion: {step.conclusion}")
             step.execution_result = step.conclusion
-            step.status = "completed"
+            session.mark_step_completed(step)
 
             perception_result = self.run_perception(
                 query=step.conclusion,
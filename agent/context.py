@@ -1,9 +1,6 @@
 from mcp_servers.multiMCP import MultiMCP
 from typing import Optional
 from pydantic import BaseModel
-import time
-import uuid
-from datetime import datetime
 
 class StrategyProfile(BaseModel):
     """
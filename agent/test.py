@@ -80,7 +80,7 @@ step2 = Step(
 step2.attempts = 1
 step2.execution_result, step2.error = "Found 3BHK, 4BHK, and 5BHK as official variants", None
 step2.perception = PerceptionSnapshot(**perception_data["steps"]["2"])
-step2.status = "completed"
+session.mark_step_completed(step2)
 steps_v3.append(step2)
 session.add_plan_version(plan_text_v3, steps_v3)
 
@@ -93,8 +93,8 @@ step3 = Step(
     description=step3_def["description"],
     type=step3_def["type"],
     conclusion="DLF Camelia has 3BHK, 4BHK, and 5BHK variants available.",
-    status="completed"
 )
+session.mark_step_completed(step3)
 step3.perception = PerceptionSnapshot(
     entities=["3BHK", "4BHK", "5BHK"],
     result_requirement="Final answer with all variants",
@@ -107,7 +107,7 @@ steps_v4.append(step3)
 session.add_plan_version(plan_text_v4, steps_v4)
 
 # Final session state
-session.state.update({
+session.update_state({
     "goal_satisfied": True,
     "final_answer": "DLF Camelia has 3BHK, 4BHK, and 5BHK variants available.",
     "confidence": 0.95,
@@ -1,5 +1,5 @@
 from decision import Decision
-import json
+import orjson
 
 def test_decision():
     """
@@ -25,7 +25,8 @@ def test_decision():
             }
         }
     )
-    print(json.dumps(result, indent=2))
-    print(result)
+    print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
 
-test_decision()
+
+if __name__ == "__main__":
+    test_decision()
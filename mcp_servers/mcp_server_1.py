@@ -1,21 +1,14 @@
-from mcp.server.fastmcp import FastMCP, Image
+from mcp.server.fastmcp import FastMCP
 from mcp.server.fastmcp.prompts import base
-from mcp.types import TextContent
-from mcp import types
-from PIL import Image as PILImage
+import functools
 import math
+import operator
 import sys
 import os
-import json
-import faiss
-import numpy as np
-from pathlib import Path
-import requests
-import subprocess
-import sqlite3
-from io import StringIO
-from tqdm import tqdm
-import hashlib
+
+# Heavy libraries (PIL, numpy) are imported inside the tools that use them:
+# this server is cold-started per stdio connection, so module import time is
+# user-visible latency. After the first call they resolve via sys.modules.
 
 # Models
 from models import (
@@ -31,6 +24,7 @@ from models import (
     CosInput, CosOutput,
     TanInput, TanOutput,
     MineInput, MineOutput,
+    VectorApplyInput, VectorApplyOutput,
     CreateThumbnailInput, ImageOutput,
     StringsToIntsInput, StringsToIntsOutput,
     ExpSumInput, ExpSumOutput,
@@ -41,6 +35,89 @@ from models import (
 
 mcp = FastMCP("Calculator")
 
+# Per-call "CALLED: ..." prints cost a write+flush per RPC; enable only when
+# debugging a server interactively.
+DEBUG = bool(os.environ.get("MCP_SERVER_DEBUG"))
+
+
+def _log_call(signature: str) -> None:
+    """
+    Prints a tool-invocation trace line when debug logging is enabled.
+
+    Args:
+        signature (str): The tool signature to log.
+    """
+    if DEBUG:
+        print(f"CALLED: {signature}")
+
+
+# Shared dispatch tables for the arithmetic tools. The per-tool wrappers stay
+# in place for MCP schema discovery; their bodies all funnel through here.
+_BINARY_OPS = {
+    "add": operator.add,
+    "subtract": operator.sub,
+    "multiply": operator.mul,
+    "divide": operator.truediv,
+    "power": operator.pow,
+    "remainder": operator.mod,
+    "mine": lambda a, b: a - b - b,
+}
+
+# Factorials for n <= 20 fit in int64 and cover the common case; answer them
+# from a precomputed table instead of calling math.factorial.
+_FACT = tuple(math.factorial(i) for i in range(21))
+
+
+def _factorial(a: int) -> int:
+    """
+    Computes a factorial, serving small n from the precomputed table.
+
+    Args:
+        a (int): The number to compute the factorial of.
+
+    Returns:
+        int: The factorial of a.
+    """
+    return _FACT[a] if 0 <= a < 21 else math.factorial(a)
+
+
+_UNARY_OPS = {
+    "cbrt": lambda a: a ** (1 / 3),
+    "factorial": _factorial,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+}
+
+
+def _binop(op: str, a, b):
+    """
+    Applies a named binary arithmetic operation.
+
+    Args:
+        op (str): Key into the binary dispatch table.
+        a: The first operand.
+        b: The second operand.
+
+    Returns:
+        The result of the operation.
+    """
+    return _BINARY_OPS[op](a, b)
+
+
+def _unop(op: str, a):
+    """
+    Applies a named unary arithmetic operation.
+
+    Args:
+        op (str): Key into the unary dispatch table.
+        a: The operand.
+
+    Returns:
+        The result of the operation.
+    """
+    return _UNARY_OPS[op](a)
+
 # ------------------- Tools -------------------
 
 @mcp.tool()
@@ -54,8 +131,8 @@ def add(input: AddInput) -> AddOutput:
     Returns:
         AddOutput: Object containing the 'result' of the addition.
     """
-    print("CALLED: add(AddInput) -> AddOutput")
-    return AddOutput(result=input.a + input.b)
+    _log_call("add(AddInput) -> AddOutput")
+    return AddOutput(result=_binop("add", input.a, input.b))
 
 @mcp.tool()
 def subtract(input: SubtractInput) -> SubtractOutput:
@@ -68,8 +145,8 @@ def subtract(input: SubtractInput) -> SubtractOutput:
     Returns:
         SubtractOutput: Object containing the 'result' of the subtraction.
     """
-    print("CALLED: subtract(SubtractInput) -> SubtractOutput")
-    return SubtractOutput(result=input.a - input.b)
+    _log_call("subtract(SubtractInput) -> SubtractOutput")
+    return SubtractOutput(result=_binop("subtract", input.a, input.b))
 
 @mcp.tool()
 def multiply(input: MultiplyInput) -> MultiplyOutput:
@@ -82,8 +159,8 @@ def multiply(input: MultiplyInput) -> MultiplyOutput:
     Returns:
         MultiplyOutput: Object containing the 'result' of the multiplication.
     """
-    print("CALLED: multiply(MultiplyInput) -> MultiplyOutput")
-    return MultiplyOutput(result=input.a * input.b)
+    _log_call("multiply(MultiplyInput) -> MultiplyOutput")
+    return MultiplyOutput(result=_binop("multiply", input.a, input.b))
 
 @mcp.tool()
 def divide(input: DivideInput) -> DivideOutput:
@@ -96,8 +173,8 @@ def divide(input: DivideInput) -> DivideOutput:
     Returns:
         DivideOutput: Object containing the 'result' of the division.
     """
-    print("CALLED: divide(DivideInput) -> DivideOutput")
-    return DivideOutput(result=input.a / input.b)
+    _log_call("divide(DivideInput) -> DivideOutput")
+    return DivideOutput(result=_binop("divide", input.a, input.b))
 
 @mcp.tool()
 def power(input: PowerInput) -> PowerOutput:
@@ -110,8 +187,8 @@ def power(input: PowerInput) -> PowerOutput:
     Returns:
         PowerOutput: Object containing the 'result' of the exponentiation.
     """
-    print("CALLED: power(PowerInput) -> PowerOutput")
-    return PowerOutput(result=input.a ** input.b)
+    _log_call("power(PowerInput) -> PowerOutput")
+    return PowerOutput(result=_binop("power", input.a, input.b))
 
 @mcp.tool()
 def cbrt(input: CbrtInput) -> CbrtOutput:
@@ -124,8 +201,8 @@ def cbrt(input: CbrtInput) -> CbrtOutput:
     Returns:
         CbrtOutput: Object containing the 'result' (cube root).
     """
-    print("CALLED: cbrt(CbrtInput) -> CbrtOutput")
-    return CbrtOutput(result=input.a ** (1/3))
+    _log_call("cbrt(CbrtInput) -> CbrtOutput")
+    return CbrtOutput(result=_unop("cbrt", input.a))
 
 @mcp.tool()
 def factorial(input: FactorialInput) -> FactorialOutput:
@@ -138,8 +215,8 @@ def factorial(input: FactorialInput) -> FactorialOutput:
     Returns:
         FactorialOutput: Object containing the 'result' (factorial).
     """
-    print("CALLED: factorial(FactorialInput) -> FactorialOutput")
-    return FactorialOutput(result=math.factorial(input.a))
+    _log_call("factorial(FactorialInput) -> FactorialOutput")
+    return FactorialOutput(result=_unop("factorial", input.a))
 
 @mcp.tool()
 def remainder(input: RemainderInput) -> RemainderOutput:
@@ -152,8 +229,8 @@ def remainder(input: RemainderInput) -> RemainderOutput:
     Returns:
         RemainderOutput: Object containing the 'result' (remainder).
     """
-    print("CALLED: remainder(RemainderInput) -> RemainderOutput")
-    return RemainderOutput(result=input.a % input.b)
+    _log_call("remainder(RemainderInput) -> RemainderOutput")
+    return RemainderOutput(result=_binop("remainder", input.a, input.b))
 
 @mcp.tool()
 def sin(input: SinInput) -> SinOutput:
@@ -166,8 +243,8 @@ def sin(input: SinInput) -> SinOutput:
     Returns:
         SinOutput: Object containing the 'result' (sine value).
     """
-    print("CALLED: sin(SinInput) -> SinOutput")
-    return SinOutput(result=math.sin(input.a))
+    _log_call("sin(SinInput) -> SinOutput")
+    return SinOutput(result=_unop("sin", input.a))
 
 @mcp.tool()
 def cos(input: CosInput) -> CosOutput:
@@ -180,8 +257,8 @@ def cos(input: CosInput) -> CosOutput:
     Returns:
         CosOutput: Object containing the 'result' (cosine value).
     """
-    print("CALLED: cos(CosInput) -> CosOutput")
-    return CosOutput(result=math.cos(input.a))
+    _log_call("cos(CosInput) -> CosOutput")
+    return CosOutput(result=_unop("cos", input.a))
 
 @mcp.tool()
 def tan(input: TanInput) -> TanOutput:
@@ -194,8 +271,8 @@ def tan(input: TanInput) -> TanOutput:
     Returns:
         TanOutput: Object containing the 'result' (tangent value).
     """
-    print("CALLED: tan(TanInput) -> TanOutput")
-    return TanOutput(result=math.tan(input.a))
+    _log_call("tan(TanInput) -> TanOutput")
+    return TanOutput(result=_unop("tan", input.a))
 
 @mcp.tool()
 def mine(input: MineInput) -> MineOutput:
@@ -208,8 +285,38 @@ def mine(input: MineInput) -> MineOutput:
     Returns:
         MineOutput: Object containing the 'result'.
     """
-    print("CALLED: mine(MineInput) -> MineOutput")
-    return MineOutput(result=input.a - input.b - input.b)
+    _log_call("mine(MineInput) -> MineOutput")
+    return MineOutput(result=_binop("mine", input.a, input.b))
+
+@mcp.tool()
+def vector_apply(input: VectorApplyInput) -> VectorApplyOutput:
+    """
+    Applies a named math function to every value in a list in one call.
+
+    Batching into one RPC amortizes validation/serialization overhead and runs
+    the math through numpy's vectorized kernels instead of one scalar call per
+    element per round-trip.
+
+    Args:
+        input (VectorApplyInput): Object containing 'op' (function name) and
+            'values', the list of numbers to transform.
+
+    Returns:
+        VectorApplyOutput: Object containing 'result', the transformed values.
+    """
+    _log_call("vector_apply(VectorApplyInput) -> VectorApplyOutput")
+    import numpy as np
+
+    fn = {
+        "sin": np.sin,
+        "cos": np.cos,
+        "tan": np.tan,
+        "exp": np.exp,
+        "log": np.log,
+        "sqrt": np.sqrt,
+    }[input.op]
+    arr = np.asarray(input.values, dtype=np.float64)
+    return VectorApplyOutput(result=fn(arr).tolist())
 
 @mcp.tool()
 def create_thumbnail(input: CreateThumbnailInput) -> ImageOutput:
@@ -222,10 +329,21 @@ def create_thumbnail(input: CreateThumbnailInput) -> ImageOutput:
     Returns:
         ImageOutput: Object containing the thumbnail 'data' (bytes) and 'format' ("png").
     """
-    print("CALLED: create_thumbnail(CreateThumbnailInput) -> ImageOutput")
+    _log_call("create_thumbnail(CreateThumbnailInput) -> ImageOutput")
+    from io import BytesIO
+
+    from PIL import Image as PILImage
+
+    # Binary payloads only cross the MCP stdio boundary because StrictModel
+    # serializes bytes fields as base64 — pydantic's utf-8 default would
+    # reject PNG data outright. The SDK owns the JSON-RPC framing, so
+    # out-of-band buffers are not an option; keep anything returned here
+    # compressed.
     img = PILImage.open(input.image_path)
-    img.thumbnail((100, 100))
-    return ImageOutput(data=img.tobytes(), format="png")
+    img.thumbnail((100, 100), PILImage.Resampling.LANCZOS)
+    buf = BytesIO()
+    img.save(buf, format="PNG")
+    return ImageOutput(data=buf.getvalue(), format="png")
 
 @mcp.tool()
 def strings_to_chars_to_int(input: StringsToIntsInput) -> StringsToIntsOutput:
@@ -238,7 +356,15 @@ def strings_to_chars_to_int(input: StringsToIntsInput) -> StringsToIntsOutput:
     Returns:
         StringsToIntsOutput: Object containing 'ascii_values', a list of integers.
     """
-    print("CALLED: strings_to_chars_to_int(StringsToIntsInput) -> StringsToIntsOutput")
+    _log_call("strings_to_chars_to_int(StringsToIntsInput) -> StringsToIntsOutput")
+    import numpy as np
+
+    if input.string.isascii():
+        # Single C-level cast instead of one ord() call per character; the
+        # encoded buffer doubles as the zero-copy byte view.
+        raw = input.string.encode("ascii")
+        ascii_values = np.frombuffer(raw, dtype=np.uint8).tolist()
+        return StringsToIntsOutput(ascii_values=ascii_values, raw_bytes=raw)
     ascii_values = [ord(char) for char in input.string]
     return StringsToIntsOutput(ascii_values=ascii_values)
 
@@ -255,8 +381,11 @@ def int_list_to_exponential_sum(input: ExpSumInput) -> ExpSumOutput:
     Returns:
         ExpSumOutput: Object containing 'result', the sum of exponentials.
     """
-    print("CALLED: int_list_to_exponential_sum(ExpSumInput) -> ExpSumOutput")
-    result = sum(math.exp(i) for i in input.numbers)
+    _log_call("int_list_to_exponential_sum(ExpSumInput) -> ExpSumOutput")
+    import numpy as np
+
+    arr = np.asarray(input.numbers, dtype=np.float64)
+    result = float(np.exp(arr).sum())
     return ExpSumOutput(result=result)
 
 @mcp.tool()
@@ -270,14 +399,16 @@ def fibonacci_numbers(input: FibonacciInput) -> FibonacciOutput:
     Returns:
         FibonacciOutput: Object containing 'result', a list of Fibonacci numbers.
     """
-    print("CALLED: fibonacci_numbers(FibonacciInput) -> FibonacciOutput")
+    _log_call("fibonacci_numbers(FibonacciInput) -> FibonacciOutput")
     n = input.n
     if n <= 0:
         return FibonacciOutput(result=[])
-    fib_sequence = [0, 1]
-    for _ in range(2, n):
-        fib_sequence.append(fib_sequence[-1] + fib_sequence[-2])
-    return FibonacciOutput(result=fib_sequence[:n])
+    fib = [0] * n
+    a, b = 0, 1
+    for i in range(n):
+        fib[i] = a
+        a, b = b, a + b
+    return FibonacciOutput(result=fib)
 
 
 
@@ -337,6 +468,20 @@ def fibonacci_numbers(input: FibonacciInput) -> FibonacciOutput:
 
 # ------------------- Resources -------------------
 
+@functools.lru_cache(maxsize=1024)
+def _build_greeting(name: str) -> str:
+    """
+    Builds (and caches) the greeting string for a name.
+
+    Args:
+        name (str): The name to include in the greeting.
+
+    Returns:
+        str: A greeting string.
+    """
+    return f"Hello, {name}!"
+
+
 @mcp.resource("greeting://{name}")
 def get_greeting(name: str) -> str:
     """
@@ -348,11 +493,25 @@ def get_greeting(name: str) -> str:
     Returns:
         str: A greeting string.
     """
-    print("CALLED: get_greeting(name: str) -> str")
-    return f"Hello, {name}!"
+    _log_call("get_greeting(name: str) -> str")
+    return _build_greeting(name)
 
 # ------------------- Prompts -------------------
 
+@functools.lru_cache(maxsize=1024)
+def _build_review(code: str) -> str:
+    """
+    Builds (and caches) the code-review prompt for a snippet.
+
+    Args:
+        code (str): The code snippet to review.
+
+    Returns:
+        str: The prompt string.
+    """
+    return f"Please review this code:\n\n{code}"
+
+
 @mcp.prompt()
 def review_code(code: str) -> str:
     """
@@ -364,7 +523,25 @@ def review_code(code: str) -> str:
     Returns:
         str: The prompt string.
     """
-    return f"Please review this code:\n\n{code}"
+    return _build_review(code)
+
+@functools.lru_cache(maxsize=256)
+def _build_debug(error: str) -> tuple:
+    """
+    Builds (and caches) the debug conversation starter for an error message.
+
+    Args:
+        error (str): The error message to debug.
+
+    Returns:
+        tuple: An immutable tuple of message objects.
+    """
+    return (
+        base.UserMessage("I'm seeing this error:"),
+        base.UserMessage(error),
+        base.AssistantMessage("I'll help debug that. What have you tried so far?"),
+    )
+
 
 @mcp.prompt()
 def debug_error(error: str) -> list:
@@ -377,11 +554,7 @@ def debug_error(error: str) -> list:
     Returns:
         list: A list of message objects representing the conversation starter.
     """
-    return [
-        base.UserMessage("I'm seeing this error:"),
-        base.UserMessage(error),
-        base.AssistantMessage("I'll help debug that. What have you tried so far?"),
-    ]
+    return list(_build_debug(error))
 
 # ------------------- Main -------------------
 
@@ -1,18 +1,51 @@
 from mcp.server.fastmcp import FastMCP, Context
 import httpx
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
+from cachetools import TTLCache
 from typing import List, Dict, Optional, Any
 from dataclasses import dataclass
-import urllib.parse
+from urllib.parse import unquote_to_bytes
 import sys
 import traceback
 import asyncio
-from datetime import datetime, timedelta
 import time
 import re
 from pydantic import BaseModel, Field
 from models import SearchInput, UrlInput
 from models import PythonCodeOutput  # Import the models we need
+import atexit
+
+# Compiled once; this regex is the final pass over every fetched page body.
+_WS_RE = re.compile(r"\s+")
+
+# Default headers for page fetches; search POSTs override with the
+# searcher's own User-Agent.
+_FETCH_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+
+# Shared HTTP client: reusing one connection pool avoids re-doing the
+# TCP+TLS handshake on every call and lets concurrent fetches multiplex
+# over a single HTTP/2 connection.
+_HTTP = httpx.AsyncClient(
+    http2=True,
+    timeout=30.0,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+    headers=_FETCH_HEADERS,
+    follow_redirects=True,
+)
+
+
+def _close_http_client():
+    """Closes the shared HTTP client when the server process exits."""
+    try:
+        asyncio.run(_HTTP.aclose())
+    except Exception:
+        pass
+
+
+atexit.register(_close_http_client)
 
 
 @dataclass
@@ -34,7 +67,10 @@ class SearchResult:
 
 class RateLimiter:
     """
-    Implements a simple rate limiter to control request frequency.
+    Implements a token-bucket rate limiter to control request frequency.
+
+    The bucket refills continuously at the configured rate; each request
+    spends one token, so admission is O(1) with no per-request history.
     """
     def __init__(self, requests_per_minute: int = 30):
         """
@@ -43,26 +79,29 @@ class RateLimiter:
         Args:
             requests_per_minute (int): Maximum allowed requests per minute.
         """
-        self.requests_per_minute = requests_per_minute
-        self.requests = []
+        self.rate = requests_per_minute / 60.0  # tokens per second
+        self.capacity = requests_per_minute
+        self.tokens = float(self.capacity)
+        self.last = time.monotonic()
+        self._lock = asyncio.Lock()
 
     async def acquire(self):
         """
         Acquires permission to make a request, waiting if necessary to respect the rate limit.
         """
-        now = datetime.now()
-        # Remove requests older than 1 minute
-        self.requests = [
-            req for req in self.requests if now - req < timedelta(minutes=1)
-        ]
+        async with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
 
-        if len(self.requests) >= self.requests_per_minute:
-            # Wait until we can make another request
-            wait_time = 60 - (now - self.requests[0]).total_seconds()
-            if wait_time > 0:
-                await asyncio.sleep(wait_time)
-
-        self.requests.append(now)
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                # Consume the refill earned while sleeping, otherwise the
+                # next caller counts the slept interval again
+                self.last = time.monotonic()
+                self.tokens = 0.0
+            else:
+                self.tokens -= 1
 
 
 class DuckDuckGoSearcher:
@@ -73,6 +112,13 @@ class DuckDuckGoSearcher:
     HEADERS = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     }
+    # Only the result blocks are ever read, so skip tree construction for the
+    # rest of the page (navigation, scripts, ads, footer). The strainer sees
+    # the raw class attribute ("result results_links"), so match it with a
+    # callable rather than an exact string.
+    RESULT_STRAINER = SoupStrainer(
+        "div", class_=lambda c: c is not None and "result" in c.split()
+    )
 
     def __init__(self):
         """
@@ -131,21 +177,16 @@ class DuckDuckGoSearcher:
 
             await ctx.info(f"Searching DuckDuckGo for: {query}")
 
-            async with httpx.AsyncClient() as client:
-                result = await client.post(
-                    self.BASE_URL, data=data, headers=self.HEADERS, timeout=30.0
-                )
-                result.raise_for_status()
+            result = await _HTTP.post(self.BASE_URL, data=data, headers=self.HEADERS)
+            result.raise_for_status()
 
-            # Parse HTML result
-            soup = BeautifulSoup(result.text, "html.parser")
-            if not soup:
-                await ctx.error("Failed to parse HTML result")
-                return []
+            # Parse only the result blocks; an empty soup just means the page
+            # had no results.
+            soup = BeautifulSoup(result.text, "lxml", parse_only=self.RESULT_STRAINER)
 
             results = []
-            for result in soup.select(".result"):
-                title_elem = result.select_one(".result__title")
+            for result in soup.find_all("div", class_="result"):
+                title_elem = result.find(class_="result__title")
                 if not title_elem:
                     continue
 
@@ -160,11 +201,13 @@ class DuckDuckGoSearcher:
                 if "y.js" in link:
                     continue
 
-                # Clean up DuckDuckGo redirect URLs
-                if link.startswith("//duckduckgo.com/l/?uddg="):
-                    link = urllib.parse.unquote(link.split("uddg=")[1].split("&")[0])
+                # Clean up DuckDuckGo redirect URLs; already-absolute links
+                # skip the whole branch
+                if link[:4] != "http" and link.startswith("//duckduckgo.com/l/?uddg="):
+                    quoted = link.partition("uddg=")[2].partition("&")[0]
+                    link = unquote_to_bytes(quoted).decode("utf-8", "replace")
 
-                snippet_elem = result.select_one(".result__snippet")
+                snippet_elem = result.find(class_="result__snippet")
                 snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
 
                 results.append(
@@ -198,12 +241,45 @@ class WebContentFetcher:
     """
     Fetches and cleans textual content from webpages.
     """
+    # Boilerplate elements whose text should never reach the LLM
+    SKIP_TAGS = {"script", "style", "nav", "header", "footer"}
+
     def __init__(self):
         """
         Initialize the WebContentFetcher with a rate limiter.
         """
         self.rate_limiter = RateLimiter(requests_per_minute=20)
 
+    def _count_text(self, elem) -> int:
+        """
+        Counts the useful text carried by one parsed element.
+
+        Each element's own text is counted at its end event and its tail
+        belongs to the enclosing element, so every text node is counted
+        exactly once. Text inside boilerplate subtrees counts as zero.
+
+        Args:
+            elem: The lxml element whose end event just fired.
+
+        Returns:
+            int: Number of useful characters this element contributed.
+        """
+        if not isinstance(elem.tag, str):
+            return 0  # comments and processing instructions
+
+        in_skipped = elem.tag in self.SKIP_TAGS or any(
+            anc.tag in self.SKIP_TAGS for anc in elem.iterancestors()
+        )
+        count = 0
+        if not in_skipped and elem.text and elem.text.strip():
+            count += len(elem.text)
+        # The tail sits after the closing tag, so only an ancestor inside a
+        # skipped subtree disqualifies it — not the element's own tag.
+        tail_skipped = any(anc.tag in self.SKIP_TAGS for anc in elem.iterancestors())
+        if not tail_skipped and elem.tail and elem.tail.strip():
+            count += len(elem.tail)
+        return count
+
     async def fetch_and_parse(self, url: str, ctx: Context) -> str:
         """
         Fetches content from a URL, parses the HTML, and extracts cleaned text.
@@ -220,34 +296,35 @@ class WebContentFetcher:
 
             await ctx.info(f"Fetching content from: {url}")
 
-            async with httpx.AsyncClient() as client:
-                result = await client.get(
-                    url,
-                    headers={
-                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                    },
-                    follow_redirects=True,
-                    timeout=30.0,
-                )
-                result.raise_for_status()
-
-            # Parse the HTML
-            soup = BeautifulSoup(result.text, "html.parser")
-
-            # Remove script and style elements
-            for element in soup(["script", "style", "nav", "header", "footer"]):
-                element.decompose()
-
-            # Get the text content
-            text = soup.get_text()
+            # Stream the body and parse it incrementally: since output is
+            # capped at 8000 chars we can stop downloading and parsing as
+            # soon as enough text has accumulated, so memory stays bounded
+            # no matter how large the page is.
+            parser = etree.HTMLPullParser(events=("end",), remove_blank_text=True)
+            total = 0
 
-            # Clean up the text
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = " ".join(chunk for chunk in chunks if chunk)
+            async with _HTTP.stream("GET", url) as result:
+                result.raise_for_status()
 
-            # Remove extra whitespace
-            text = re.sub(r"\s+", " ", text).strip()
+                async for chunk in result.aiter_text():
+                    parser.feed(chunk)
+                    for _, elem in parser.read_events():
+                        total += self._count_text(elem)
+                    if total >= 8000:
+                        break
+
+            # The recovering HTML parser finalizes whatever was fed, so a
+            # mid-page stop still yields a usable partial tree. An empty
+            # body gives it nothing to build, which it reports by raising.
+            try:
+                root = parser.close()
+            except etree.XMLSyntaxError:
+                root = None
+            if root is not None:
+                etree.strip_elements(root, *self.SKIP_TAGS, with_tail=False)
+                text = _WS_RE.sub(" ", " ".join(root.itertext())).strip()
+            else:
+                text = ""
 
             # Truncate if too long
             if len(text) > 8000:
@@ -274,6 +351,16 @@ mcp = FastMCP("ddg-search")
 searcher = DuckDuckGoSearcher()
 fetcher = WebContentFetcher()
 
+# TTL caches: agent loops often revisit the same query or URL, and a hit
+# skips the network round-trip, the HTML parse and the rate-limit token.
+_SEARCH_CACHE = TTLCache(maxsize=1024, ttl=600)
+_FETCH_CACHE = TTLCache(maxsize=512, ttl=1800)
+
+# Single-flight bookkeeping: concurrent identical requests await the same
+# future instead of each burning a rate-limit token and a network call.
+# Search entries are keyed by (query, max_results) tuples, fetches by URL.
+_INFLIGHT: dict = {}
+
 
 @mcp.tool()
 async def duckduckgo_search_results(input: SearchInput, ctx: Context) -> PythonCodeOutput:
@@ -288,8 +375,31 @@ async def duckduckgo_search_results(input: SearchInput, ctx: Context) -> PythonC
         PythonCodeOutput: Object containing the formatted search results string.
     """
     try:
-        results = await searcher.search(input.query, ctx, input.max_results)
-        return PythonCodeOutput(result=searcher.format_results_for_llm(results))
+        cache_key = (input.query, input.max_results)
+        cached = _SEARCH_CACHE.get(cache_key)
+        if cached is not None:
+            return PythonCodeOutput(result=cached)
+
+        pending = _INFLIGHT.get(cache_key)
+        if pending is not None:
+            # Shielded so one caller being cancelled doesn't poison the rest
+            return PythonCodeOutput(result=await asyncio.shield(pending))
+
+        future = asyncio.get_running_loop().create_future()
+        _INFLIGHT[cache_key] = future
+        try:
+            results = await searcher.search(input.query, ctx, input.max_results)
+            formatted = searcher.format_results_for_llm(results)
+            if results:
+                _SEARCH_CACHE[cache_key] = formatted
+            future.set_result(formatted)
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # waiters still receive it; avoids GC warnings
+            raise
+        finally:
+            _INFLIGHT.pop(cache_key, None)
+        return PythonCodeOutput(result=formatted)
     except Exception as e:
         traceback.print_exc(file=sys.stderr)
         return f"An error occurred while searching: {str(e)}"
@@ -307,7 +417,29 @@ async def download_raw_html_from_url(input: UrlInput, ctx: Context) -> PythonCod
     Returns:
         PythonCodeOutput: Object containing the parsed text content.
     """
-    return PythonCodeOutput(result=await fetcher.fetch_and_parse(input.url, ctx))
+    cached = _FETCH_CACHE.get(input.url)
+    if cached is not None:
+        return PythonCodeOutput(result=cached)
+
+    pending = _INFLIGHT.get(input.url)
+    if pending is not None:
+        # Shielded so one caller being cancelled doesn't poison the rest
+        return PythonCodeOutput(result=await asyncio.shield(pending))
+
+    future = asyncio.get_running_loop().create_future()
+    _INFLIGHT[input.url] = future
+    try:
+        text = await fetcher.fetch_and_parse(input.url, ctx)
+        if not text.startswith("Error:"):
+            _FETCH_CACHE[input.url] = text
+        future.set_result(text)
+    except BaseException as exc:
+        future.set_exception(exc)
+        future.exception()  # waiters still receive it; avoids GC warnings
+        raise
+    finally:
+        _INFLIGHT.pop(input.url, None)
+    return PythonCodeOutput(result=text)
 
 
 if __name__ == "__main__":
@@ -1,34 +1,13 @@
-from mcp.server.fastmcp import FastMCP, Image
-from mcp.server.fastmcp.prompts import base
-from mcp.types import TextContent
-from mcp import types
-from PIL import Image as PILImage
-import math
+from mcp.server.fastmcp import FastMCP
 import sys
-import os
-import json
-import faiss
-import numpy as np
-from pathlib import Path
-import requests
-import subprocess
-import sqlite3
-from io import StringIO
-from tqdm import tqdm
-import hashlib
+
+# Heavy libraries (numpy) are imported inside the tools that need them, so
+# the server subprocess starts fast and stays small for the simple tools.
 
 # Models
 from models import (
     AddInput, AddOutput,
     SubtractInput, SubtractOutput,
-    CbrtInput, CbrtOutput,
-    FactorialInput, FactorialOutput,
-    RemainderInput, RemainderOutput,
-    SinInput, SinOutput,
-    CosInput, CosOutput,
-    TanInput, TanOutput,
-    MineInput, MineOutput,
-    CreateThumbnailInput, ImageOutput,
     StringsToIntsInput, StringsToIntsOutput,
     ExpSumInput, ExpSumOutput
 )
@@ -101,7 +80,12 @@ def int_list_to_exponential_sum(input: ExpSumInput) -> ExpSumOutput:
         ExpSumOutput: Object containing the 'result'.
     """
     print("CALLED: int_list_to_exponential_sum(ExpSumInput) -> ExpSumOutput")
-    result = sum(math.exp(i) for i in input.numbers)  # ✅ FIXED
+    import numpy as np
+
+    # Vectorized: one libm pass over the whole array instead of a Python
+    # generator calling math.exp per element
+    arr = np.asarray(input.numbers, dtype=np.float64)
+    result = float(np.exp(arr).sum())
     return ExpSumOutput(result=result)
 
 
@@ -117,7 +101,11 @@ def strings_to_chars_to_int(input: StringsToIntsInput) -> StringsToIntsOutput:
         StringsToIntsOutput: Object containing 'ascii_values'.
     """
     print("CALLED: strings_to_chars_to_int(StringsToIntsInput) -> StringsToIntsOutput")
-    ascii_values = [ord(char) for char in input.string]
+    if input.string.isascii():
+        # encode + list(bytes) run in C, skipping the per-char ord() calls
+        ascii_values = list(input.string.encode("ascii"))
+    else:
+        ascii_values = [ord(char) for char in input.string]
     return StringsToIntsOutput(ascii_values=ascii_values)
 
 # ------------------- Main -------------------
@@ -1,211 +1,242 @@
-from pydantic import BaseModel, Field
-from typing import List
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Literal, Optional
+
+
+class StrictModel(BaseModel):
+    """Shared base for tool I/O models.
+
+    Frozen and closed to unknown fields: instances are plain immutable
+    payloads, which keeps validation on pydantic v2's compiled fast path
+    and catches misspelled arguments at the MCP boundary. Bytes fields
+    serialize as base64 — pydantic's utf-8 default cannot represent
+    binary payloads like PNG data in JSON.
+    """
+    model_config = ConfigDict(
+        extra="forbid",
+        frozen=True,
+        ser_json_bytes="base64",
+        val_json_bytes="base64",
+    )
 
 # --- Math Tools ---
 
-class AddInput(BaseModel):
+class AddInput(StrictModel):
     """Input model for addition operation."""
     a: int
     b: int
 
-class AddOutput(BaseModel):
+class AddOutput(StrictModel):
     """Output model for addition operation."""
     result: int
 
-class SubtractInput(BaseModel):
+class SubtractInput(StrictModel):
     """Input model for subtraction operation."""
     a: int
     b: int
 
-class SubtractOutput(BaseModel):
+class SubtractOutput(StrictModel):
     """Output model for subtraction operation."""
     result: int
 
-class MultiplyInput(BaseModel):
+class MultiplyInput(StrictModel):
     """Input model for multiplication operation."""
     a: int
     b: int
 
-class MultiplyOutput(BaseModel):
+class MultiplyOutput(StrictModel):
     """Output model for multiplication operation."""
     result: int
 
-class SqrtInput(BaseModel):
+class SqrtInput(StrictModel):
     """Input model for square root operation."""
     a: int
     b: int
 
-class SqrtOutput(BaseModel):
+class SqrtOutput(StrictModel):
     """Output model for square root operation."""
     result: int
 
-class DivideInput(BaseModel):
+class DivideInput(StrictModel):
     """Input model for division operation."""
     a: int
     b: int
 
-class DivideOutput(BaseModel):
+class DivideOutput(StrictModel):
     """Output model for division operation."""
     result: float
 
-class PowerInput(BaseModel):
+class PowerInput(StrictModel):
     """Input model for power operation."""
     a: int
     b: int
 
-class PowerOutput(BaseModel):
+class PowerOutput(StrictModel):
     """Output model for power operation."""
     result: int
 
-class CbrtInput(BaseModel):
+class CbrtInput(StrictModel):
     """Input model for cube root operation."""
     a: int
 
-class CbrtOutput(BaseModel):
+class CbrtOutput(StrictModel):
     """Output model for cube root operation."""
     result: float
 
-class FactorialInput(BaseModel):
+class FactorialInput(StrictModel):
     """Input model for factorial operation."""
     a: int
 
-class FactorialOutput(BaseModel):
+class FactorialOutput(StrictModel):
     """Output model for factorial operation."""
     result: int
 
-class RemainderInput(BaseModel):
+class RemainderInput(StrictModel):
     """Input model for remainder operation."""
     a: int
     b: int
 
-class RemainderOutput(BaseModel):
+class RemainderOutput(StrictModel):
     """Output model for remainder operation."""
     result: int
 
-class SinInput(BaseModel):
+class SinInput(StrictModel):
     """Input model for sine operation."""
     a: int
 
-class SinOutput(BaseModel):
+class SinOutput(StrictModel):
     """Output model for sine operation."""
     result: float
 
-class CosInput(BaseModel):
+class CosInput(StrictModel):
     """Input model for cosine operation."""
     a: int
 
-class CosOutput(BaseModel):
+class CosOutput(StrictModel):
     """Output model for cosine operation."""
     result: float
 
-class TanInput(BaseModel):
+class TanInput(StrictModel):
     """Input model for tangent operation."""
     a: int
 
-class TanOutput(BaseModel):
+class TanOutput(StrictModel):
     """Output model for tangent operation."""
     result: float
 
-class MineInput(BaseModel):
+class MineInput(StrictModel):
     """Input model for 'mine' operation."""
     a: int
     b: int
 
-class MineOutput(BaseModel):
+class MineOutput(StrictModel):
     """Output model for 'mine' operation."""
     result: int
 
+class VectorApplyInput(StrictModel):
+    """Input model for applying a math function to a whole list of values."""
+    op: Literal["sin", "cos", "tan", "exp", "log", "sqrt"]
+    values: List[float]
+
+class VectorApplyOutput(StrictModel):
+    """Output model for applying a math function to a whole list of values."""
+    result: List[float]
+
 # --- String & List Tools ---
 
-class StringsToIntsInput(BaseModel):
+class StringsToIntsInput(StrictModel):
     """Input model for converting string to integer list."""
     string: str
 
-class StringsToIntsOutput(BaseModel):
-    """Output model for converting string to integer list."""
+class StringsToIntsOutput(StrictModel):
+    """Output model for converting string to integer list.
+
+    raw_bytes carries the same values as a single compact buffer; consumers
+    that only need the byte view can use it and skip the per-int boxing.
+    """
     ascii_values: List[int]
+    raw_bytes: Optional[bytes] = None
 
 
-class ExpSumInput(BaseModel):
+class ExpSumInput(StrictModel):
     """Input model for exponential sum operation."""
     numbers: List[int]
 
-class ExpSumOutput(BaseModel):
+class ExpSumOutput(StrictModel):
     """Output model for exponential sum operation."""
     result: float
 
-class FibonacciInput(BaseModel):
+class FibonacciInput(StrictModel):
     """Input model for generating Fibonacci numbers."""
     n: int
 
-class FibonacciOutput(BaseModel):
+class FibonacciOutput(StrictModel):
     """Output model for generating Fibonacci numbers."""
     result: List[int]
 
 # --- Image Tools ---
 
-class CreateThumbnailInput(BaseModel):
+class CreateThumbnailInput(StrictModel):
     """Input model for creating an image thumbnail."""
     image_path: str
 
-class ImageOutput(BaseModel):
+class ImageOutput(StrictModel):
     """Output model for image operations."""
     data: bytes
     format: str
 
 # --- Shell, Python, SQL Tools ---
 
-class PythonCodeInput(BaseModel):
+class PythonCodeInput(StrictModel):
     """Input model for executing Python code."""
     code: str
 
-class PythonCodeOutput(BaseModel):
+class PythonCodeOutput(StrictModel):
     """Output model for executing Python code."""
     result: str
 
-class ShellCommandInput(BaseModel):
+class ShellCommandInput(StrictModel):
     """Input model for executing shell commands."""
     command: str
 
 # --- RAG and Extraction Tools ---
 
-class UrlInput(BaseModel):
+class UrlInput(StrictModel):
     """Input model for URL-based operations."""
     url: str
 
-class FilePathInput(BaseModel):
+class FilePathInput(StrictModel):
     """Input model for file path operations."""
     file_path: str
 
-class MarkdownInput(BaseModel):
+class MarkdownInput(StrictModel):
     """Input model for Markdown processing."""
     text: str
 
-class MarkdownOutput(BaseModel):
+class MarkdownOutput(StrictModel):
     """Output model for Markdown processing."""
     markdown: str
 
-class ChunkListOutput(BaseModel):
+class ChunkListOutput(StrictModel):
     """Output model for text chunking."""
     chunks: List[str]
 
 # --- Memory Search ---
 
-class SearchMemoryInput(BaseModel):
+class SearchMemoryInput(StrictModel):
     """Input model for searching memory."""
     query: str
 
-class EmptyInput(BaseModel):
+class EmptyInput(StrictModel):
     """Model for empty input."""
     pass
 
 # --- Search Tools ---
 
-class SearchInput(BaseModel):
+class SearchInput(StrictModel):
     """Input model for search operations."""
     query: str
     max_results: int = Field(default=10, description="Maximum number of results to return")
 
-class SearchDocumentsInput(BaseModel):
+class SearchDocumentsInput(StrictModel):
     """Input model for searching stored documents."""
     query: str
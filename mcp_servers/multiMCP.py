@@ -1,13 +1,91 @@
 import os
+import re
 import sys
 import asyncio
-import json
-from typing import Optional, Any, List, Dict
+import functools
+import orjson
+from typing import Optional, Any, List, Dict, Tuple
 from inspect import signature
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 import ast
 
+# Matches "name(arg, arg, ...)" — the shape of every LLM-emitted call string
+_CALL_RE = re.compile(r"^([A-Za-z_]\w*)\((.*)\)$", re.DOTALL)
+
+
+def _split_call_args(argstr: str) -> List[str]:
+    """
+    Splits a call's argument string on top-level commas.
+
+    Commas inside quotes or nested brackets/parens do not split, so list,
+    tuple and string arguments survive intact.
+
+    Args:
+        argstr (str): The text between the call's outer parentheses.
+
+    Returns:
+        List[str]: The individual argument expressions, stripped.
+    """
+    parts = []
+    depth = 0
+    quote = None
+    escaped = False
+    start = 0
+    for i, ch in enumerate(argstr):
+        if quote:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == quote:
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+        elif ch in "([{":
+            depth += 1
+        elif ch in ")]}":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(argstr[start:i])
+            start = i + 1
+    parts.append(argstr[start:])
+    return [p for p in (part.strip() for part in parts) if p]
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_call_string(call: str) -> Tuple[str, tuple]:
+    """
+    Parses a string-form tool call like "add(45, 55)" into (name, args).
+
+    The common case — a name followed by literal arguments — goes through a
+    regex match plus per-argument literal_eval, which is several times
+    cheaper than building a full AST. Anything unusual falls back to
+    ast.parse. Results are memoized since agents often repeat identical
+    call strings.
+
+    Args:
+        call (str): The stripped call string.
+
+    Returns:
+        Tuple[str, tuple]: The tool name and its evaluated arguments.
+
+    Raises:
+        ValueError: If the string is not a simple function call.
+    """
+    match = _CALL_RE.match(call)
+    if match:
+        name, argstr = match.groups()
+        try:
+            return name, tuple(ast.literal_eval(arg) for arg in _split_call_args(argstr))
+        except Exception:
+            pass  # oddly nested input — let the full parser decide
+
+    expr = ast.parse(call, mode='eval').body
+    if not isinstance(expr, ast.Call) or not isinstance(expr.func, ast.Name):
+        raise ValueError("Invalid function call format")
+    return expr.func.id, tuple(ast.literal_eval(arg) for arg in expr.args)
+
 class MCP:
     """
     Represents a single MCP (Model Context Protocol) server connection.
@@ -86,42 +164,109 @@ class MultiMCP:
         self.server_configs = server_configs
         self.tool_map: Dict[str, Dict[str, Any]] = {}
         self.server_tools: Dict[str, List[Any]] = {}
+        # One long-lived session per server, each owned by its own task so
+        # tool calls reuse the subprocess instead of respawning it each time
+        self.sessions: Dict[str, ClientSession] = {}
+        self._session_locks: Dict[str, asyncio.Lock] = {}
+        self._server_tasks: List[asyncio.Task] = []
+        self._scan_results: Dict[str, List[Any]] = {}
+        self._stop = asyncio.Event()
+        self._desc_cache: Optional[List[str]] = None
+
+    async def _run_server(self, config: dict, ready: asyncio.Event):
+        """
+        Owns one server's connection for its whole lifetime.
+
+        The stdio_client and ClientSession contexts are entered and exited
+        inside this task — anyio cancel scopes must close in the task that
+        opened them — so the session stays alive until shutdown sets the
+        stop event. `ready` fires once the scan finished (or failed).
+
+        Args:
+            config (dict): The configuration of the server to run.
+            ready (asyncio.Event): Set once tools are published or on error.
+        """
+        try:
+            params = StdioServerParameters(
+                command=sys.executable,
+                args=[config["script"]],
+                cwd=config.get("cwd", os.getcwd())
+            )
+            print(f"→ Scanning tools from: {config['script']} in {params.cwd}")
+            async with stdio_client(params) as (read, write):
+                print("Connection established, creating session...")
+                try:
+                    async with ClientSession(read, write) as session:
+                        print("[agent] Session created, initializing...")
+                        await session.initialize()
+                        print("[agent] MCP session initialized")
+                        tools = await session.list_tools()
+                        print(f"\n→ Tools received: {[tool.name for tool in tools.tools]}")
+                        self.sessions[config["id"]] = session
+                        self._session_locks[config["id"]] = asyncio.Lock()
+                        self._scan_results[config["id"]] = list(tools.tools)
+                        ready.set()
+                        # Hold the session open until shutdown
+                        await self._stop.wait()
+                except Exception as se:
+                    print(f"❌ Session error: {se}")
+        except Exception as e:
+            print(f"❌ Error initializing MCP server {config['script']}: {e}")
+        finally:
+            self.sessions.pop(config["id"], None)
+            ready.set()
 
     async def initialize(self):
         """
         Initializes connections to all configured MCP servers and aggregates their tools.
+
+        All servers start concurrently, so startup takes as long as the
+        slowest server rather than the sum of all of them. Each server gets
+        a long-lived task that keeps its session open for later tool calls.
         """
         print("in MultiMCP initialize")
+        ready_events = []
+        for config in self.server_configs:
+            ready = asyncio.Event()
+            self._server_tasks.append(
+                asyncio.create_task(self._run_server(config, ready))
+            )
+            ready_events.append(ready)
+        await asyncio.gather(*(ready.wait() for ready in ready_events))
+
         for config in self.server_configs:
-            try:
-                params = StdioServerParameters(
-                    command=sys.executable,
-                    args=[config["script"]],
-                    cwd=config.get("cwd", os.getcwd())
-                )
-                print(f"→ Scanning tools from: {config['script']} in {params.cwd}")
-                async with stdio_client(params) as (read, write):
-                    print("Connection established, creating session...")
-                    try:
-                        async with ClientSession(read, write) as session:
-                            print("[agent] Session created, initializing...")
-                            await session.initialize()
-                            print("[agent] MCP session initialized")
-                            tools = await session.list_tools()
-                            print(f"\n→ Tools received: {[tool.name for tool in tools.tools]}")
-                            for tool in tools.tools:
-                                self.tool_map[tool.name] = {
-                                    "config": config,
-                                    "tool": tool
-                                }
-                                server_key = config["id"]
-                                if server_key not in self.server_tools:
-                                    self.server_tools[server_key] = []
-                                self.server_tools[server_key].append(tool)
-                    except Exception as se:
-                        print(f"❌ Session error: {se}")
-            except Exception as e:
-                print(f"❌ Error initializing MCP server {config['script']}: {e}")
+            tools = self._scan_results.get(config["id"], [])
+            for tool in tools:
+                props, wraps_input = self._schema_properties(tool)
+                self.tool_map[tool.name] = {
+                    "config": config,
+                    "tool": tool,
+                    # Resolved once here so dispatch never re-walks the schema
+                    "param_names": list(props.keys()),
+                    "wraps_input": wraps_input,
+                }
+                server_key = config["id"]
+                if server_key not in self.server_tools:
+                    self.server_tools[server_key] = []
+                self.server_tools[server_key].append(tool)
+        self._desc_cache = None
+
+    @staticmethod
+    def _schema_properties(tool) -> tuple:
+        """
+        Resolves a tool's parameter properties from its input schema.
+
+        Args:
+            tool: The tool whose inputSchema to inspect.
+
+        Returns:
+            tuple: (properties dict, whether params are wrapped in an 'input' model).
+        """
+        schema = tool.inputSchema
+        if "input" in schema.get("properties", {}):
+            inner_key = next(iter(schema.get("$defs", {})), None)
+            return schema["$defs"][inner_key]["properties"], True
+        return schema["properties"], False
 
     async def call_tool(self, tool_name: str, arguments: dict) -> Any:
         """
@@ -141,17 +286,15 @@ class MultiMCP:
         if not entry:
             raise ValueError(f"Tool '{tool_name}' not found on any server.")
 
-        config = entry["config"]
-        params = StdioServerParameters(
-            command=sys.executable,
-            args=[config["script"]],
-            cwd=config.get("cwd", os.getcwd())
-        )
+        server_key = entry["config"]["id"]
+        session = self.sessions.get(server_key)
+        if session is None:
+            raise ValueError(f"No active session for server '{server_key}'.")
 
-        async with stdio_client(params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                return await session.call_tool(tool_name, arguments)
+        # The stdio pipe carries one request/response pair at a time, so
+        # serialize calls to the same server
+        async with self._session_locks[server_key]:
+            return await session.call_tool(tool_name, arguments)
 
 
 
@@ -176,11 +319,7 @@ class MultiMCP:
             stripped = tool_name.strip()
             if stripped.endswith(")") and "(" in stripped:
                 try:
-                    expr = ast.parse(stripped, mode='eval').body
-                    if not isinstance(expr, ast.Call) or not isinstance(expr.func, ast.Name):
-                        raise ValueError("Invalid function call format")
-                    tool_name = expr.func.id
-                    args = [ast.literal_eval(arg) for arg in expr.args]
+                    tool_name, args = _parse_call_string(stripped)
                 except Exception as e:
                     raise ValueError(f"Failed to parse function string '{tool_name}': {e}")
 
@@ -190,41 +329,32 @@ class MultiMCP:
         if not tool_entry:
             raise ValueError(f"Tool '{tool_name}' not found.")
 
-        tool = tool_entry["tool"]
-        schema = tool.inputSchema
-        params = {}
-
-        # ── Build input payload ──────────────────────────────
-        if "input" in schema.get("properties", {}):
-            inner_key = next(iter(schema.get("$defs", {})), None)
-            inner_props = schema["$defs"][inner_key]["properties"]
-            param_names = list(inner_props.keys())
-            if len(param_names) != len(args):
-                raise ValueError(f"{tool_name} expects {len(param_names)} args, got {len(args)}")
-            params["input"] = dict(zip(param_names, args))
+        # ── Build input payload from the precomputed parameter info ──────────
+        param_names = tool_entry["param_names"]
+        if len(param_names) != len(args):
+            raise ValueError(f"{tool_name} expects {len(param_names)} args, got {len(args)}")
+        if tool_entry["wraps_input"]:
+            params = {"input": dict(zip(param_names, args))}
         else:
-            param_names = list(schema["properties"].keys())
-            if len(param_names) != len(args):
-                raise ValueError(f"{tool_name} expects {len(param_names)} args, got {len(args)}")
             params = dict(zip(param_names, args))
 
         # ── Call and Normalize Output ────────────────────────
         result = await self.call_tool(tool_name, params)
 
         try:
-            content_text = getattr(result, "content", [])[0].text.strip()
-            parsed = json.loads(content_text)
+            # orjson tolerates surrounding whitespace, so no strip() needed
+            parsed = orjson.loads(result.content[0].text)
+        except (orjson.JSONDecodeError, IndexError, AttributeError):
+            return result  # fallback if parse fails
 
-            if isinstance(parsed, dict):
-                if "result" in parsed:
-                    return parsed["result"]
-                if len(parsed) == 1:
-                    return next(iter(parsed.values()))
-                return parsed
+        if isinstance(parsed, dict):
+            if "result" in parsed:
+                return parsed["result"]
+            if len(parsed) == 1:
+                return next(iter(parsed.values()))
+            return parsed
 
-            return parsed  # primitive type
-        except Exception:
-            return result  # fallback if parse fails
+        return parsed  # primitive type
 
 
 
@@ -235,14 +365,12 @@ class MultiMCP:
         Returns:
             List[str]: A list of formatted tool usage strings (e.g., "tool(type, type) # description").
         """
+        if self._desc_cache is not None:
+            return self._desc_cache
+
         examples = []
         for tool in self.get_all_tools():
-            schema = tool.inputSchema
-            if "input" in schema.get("properties", {}):
-                inner_key = next(iter(schema.get("$defs", {})), None)
-                props = schema["$defs"][inner_key]["properties"]
-            else:
-                props = schema["properties"]
+            props, _ = self._schema_properties(tool)
 
             arg_types = []
             for k, v in props.items():
@@ -251,6 +379,7 @@ class MultiMCP:
 
             signature_str = ", ".join(arg_types)
             examples.append(f"{tool.name}({signature_str})  # {tool.description}")
+        self._desc_cache = examples
         return examples
 
 
@@ -291,6 +420,14 @@ class MultiMCP:
 
     async def shutdown(self):
         """
-        Perform shutdown operations if needed.
+        Closes all persistent server sessions and their subprocesses.
+
+        Signals every server task to exit its contexts (in the task that
+        entered them) and waits for them to finish.
         """
-        pass
+        self._stop.set()
+        if self._server_tasks:
+            await asyncio.gather(*self._server_tasks)
+        self._server_tasks.clear()
+        self.sessions.clear()
+        self._session_locks.clear()